@@ -1,43 +1,161 @@
+import csv
+import functools
+import html
+import io
+import multiprocessing
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
 import streamlit as st
 from spellchecker import SpellChecker
-import nltk
-nltk.download("punkt")
-nltk.download("punkt_tab")
-from nltk.tokenize import word_tokenize
-from nltk.tokenize.treebank import TreebankWordDetokenizer
-import pandas as pd
+import numpy as np
+
+# 철자 검사 대상은 알파벳 토큰뿐이므로 Punkt/Treebank 대신 정규식 한 번으로 충분
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z']*")
+
+# 이보다 큰 텍스트는 줄 단위 조각으로 나눠 처리 (토큰 구조의 피크 메모리 제한)
+_LARGE_TEXT_CHARS = 10 * 1024 * 1024
+
+# 고유 오타가 이보다 많을 때만 교정 탐색을 프로세스 풀로 분산
+# (풀 기동 + 워커별 사전/트라이 구축 비용보다 이득이 나는 규모)
+_PARALLEL_CORRECTION_MIN = 256
+
+# bytes.translate용 분류 테이블: 대문자→1, 아포스트로피→2, 그 외→0
+_BYTE_CLASS = bytes(1 if 65 <= b <= 90 else 2 if b == 39 else 0 for b in range(256))
+
+
+@st.cache_resource(show_spinner=False)
+def get_spell_checker():
+    """영어 사전(~190k 단어) 로딩은 수백 ms — 리런마다가 아니라 프로세스당 한 번만."""
+    return SpellChecker(language="en")
+
+
+@st.cache_resource(show_spinner=False)
+def get_known_words(_spell_checker):
+    """사전 키의 frozenset 스냅샷 — 미등재 단어 판별을 C 레벨 집합 연산 한 번으로."""
+    return frozenset(_spell_checker.word_frequency.dictionary.keys())
+
+
+@st.cache_data(show_spinner=False)
+def parse_ignore_list(name, size, _raw):
+    """업로드된 무시 단어 리스트 파싱 (파일 이름+크기를 캐시 키로 사용)."""
+    content = _raw.decode("utf-8", errors="ignore")
+    return {line.strip().lower() for line in content.splitlines() if line.strip()}
 
 
 # ----------------------------
-# NLTK setup
+# Dictionary trie
 # ----------------------------
-def ensure_nltk():
-    """Ensure required NLTK resources exist (download once if missing)."""
-    try:
-        nltk.data.find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt")
+_TRIE_END = "\0"
+
+
+@st.cache_resource(show_spinner=False)
+def build_dictionary_trie(_spell_checker):
+    """영어 사전 단어로 중첩 dict 트라이 구성 (단말 키에 빈도 저장, 프로세스당 1회)."""
+    trie = {}
+    for word, freq in _spell_checker.word_frequency.dictionary.items():
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_TRIE_END] = freq
+    return trie
+
+
+def trie_correct(word, trie, max_dist=2):
+    """트라이를 내려가며 Levenshtein DP 행을 유지하는 교정 탐색.
+
+    행 최솟값이 편집 예산을 넘는 가지는 잘라내고, 예산 안의 단말 중
+    (편집 거리, 빈도) 기준 최적 단어를 반환한다. 인접 전치(Damerau)도
+    편집 1회로 센다 (pyspellchecker의 후보 생성과 동일 기준).
+    후보가 없으면 원래 단어 반환.
+    """
+    n = len(word)
+    best_dist = max_dist
+    best_freq = -1
+    best_word = None
+
+    def _walk(node, prefix, prev_row, prev_prev_row, prev_ch):
+        nonlocal best_dist, best_freq, best_word
+        for ch, child in node.items():
+            if ch == _TRIE_END:
+                dist = prev_row[n]
+                if dist < best_dist or (dist == best_dist and child > best_freq):
+                    best_dist, best_freq, best_word = dist, child, prefix
+                continue
+            row = [prev_row[0] + 1]
+            append = row.append
+            for j in range(1, n + 1):
+                cost = 0 if word[j - 1] == ch else 1
+                val = min(row[j - 1] + 1, prev_row[j] + 1, prev_row[j - 1] + cost)
+                if (
+                    prev_prev_row is not None
+                    and j > 1
+                    and word[j - 1] == prev_ch
+                    and word[j - 2] == ch
+                ):
+                    val = min(val, prev_prev_row[j - 2] + 1)
+                append(val)
+            if min(row) <= best_dist:
+                _walk(child, prefix + ch, row, prev_row, ch)
+
+    _walk(trie, "", list(range(n + 1)), None, "")
+    return best_word if best_word is not None else word
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
 def tokenize_text(text):
-    return word_tokenize(text)
+    return _WORD_RE.findall(text)
+
+
+def _iter_line_chunks(text, max_chars=_LARGE_TEXT_CHARS):
+    """text를 가능한 한 줄 경계에서 max_chars 이하 조각으로 나눠 순서대로 낸다."""
+    start = 0
+    n = len(text)
+    while start < n:
+        end = min(start + max_chars, n)
+        if end < n:
+            nl = text.rfind("\n", start, end)
+            if nl > start:
+                end = nl + 1
+        yield text[start:end]
+        start = end
+
+
+def _candidate_mask(text, starts, ends, min_len, ignore_all_caps, ignore_title):
+    """원문 바이트 버퍼와 토큰 오프셋만으로 후보 마스크를 NumPy로 계산.
+
+    _WORD_RE 토큰은 ASCII 알파벳과 아포스트로피뿐이므로 바이트 비교만으로
+    isalpha/isupper/istitle 판정이 가능하다. 토큰 문자열을 만들지 않고
+    구간 합(누적합 차)으로 토큰별 집계를 얻는다.
+    """
+    if ends.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    # errors="replace"는 코드포인트당 1바이트를 보장하므로 오프셋이 그대로 맞는다
+    classes = np.frombuffer(
+        text.encode("ascii", "replace").translate(_BYTE_CLASS), dtype=np.uint8
+    )
+    lengths = ends - starts
 
+    apo_csum = np.concatenate(([0], np.cumsum(classes == 2, dtype=np.int64)))
+    mask = (apo_csum[ends] - apo_csum[starts]) == 0
 
-def is_candidate_word(tok, min_len, ignore_all_caps, ignore_title):
-    if not isinstance(tok, str):
-        return False
-    if not tok.isalpha():
-        return False
-    if len(tok) < min_len:
-        return False
-    if ignore_all_caps and tok.isupper():
-        return False
-    if ignore_title and tok.istitle():
-        return False
-    return True
+    # 옵션이 요구하는 집계만 계산 (파일 단위로 상수인 플래그를 패스 자체에 반영)
+    if min_len > 1:
+        mask &= lengths >= min_len
+    if ignore_all_caps or ignore_title:
+        is_upper = classes == 1
+        up_csum = np.concatenate(([0], np.cumsum(is_upper, dtype=np.int64)))
+        n_upper = up_csum[ends] - up_csum[starts]
+        if ignore_all_caps:
+            mask &= n_upper != lengths
+        if ignore_title:
+            mask &= ~((n_upper == 1) & is_upper[starts])
+    return mask
 
 
 def run_spellcheck_on_text(
@@ -49,68 +167,171 @@ def run_spellcheck_on_text(
     ignore_title,
     custom_ignore=None,
 ):
-    detok = TreebankWordDetokenizer()
-    tokens = tokenize_text(text)
-
-    candidate_indices = []
-    candidate_words = []
-
-    for i, tok in enumerate(tokens):
-        if is_candidate_word(tok, min_len, ignore_all_caps, ignore_title):
-            lw = tok.lower()
-            if custom_ignore and lw in custom_ignore:
-                continue
-            candidate_indices.append(i)
-            candidate_words.append(lw)
+    if len(text) > _LARGE_TEXT_CHARS:
+        return _run_spellcheck_chunked(
+            text,
+            filename,
+            spell_checker,
+            min_len,
+            ignore_all_caps,
+            ignore_title,
+            custom_ignore,
+        )
 
-    misspelled = spell_checker.unknown(candidate_words)
+    # 토큰 문자열 N개를 만들지 않고 (start, end) 오프셋만 int32로 보관;
+    # 부분 문자열은 후보/교정이 확정된 위치에서만 실체화한다
+    spans = np.fromiter(
+        (pos for m in _WORD_RE.finditer(text) for pos in m.span()),
+        dtype=np.int32,
+    ).reshape(-1, 2)
+    starts = spans[:, 0]
+    ends = spans[:, 1]
+
+    mask = _candidate_mask(text, starts, ends, min_len, ignore_all_caps, ignore_title)
+    # int64 기본값 대신 int32로 보관 — 인덱스 저장 메모리 절반
+    candidate_indices = np.flatnonzero(mask).astype(np.int32)
+    candidate_words = [text[starts[i] : ends[i]].lower() for i in candidate_indices]
+    if custom_ignore:
+        kept = [j for j, w in enumerate(candidate_words) if w not in custom_ignore]
+        candidate_indices = candidate_indices[kept]
+        candidate_words = [candidate_words[j] for j in kept]
+
+    # 후보를 중복 제거한 뒤 사전 frozenset과의 차집합으로 오타 집합 계산
+    # (spell_checker.unknown의 단어별 파이썬 메서드 호출을 건너뜀)
+    misspelled = set(candidate_words) - get_known_words(spell_checker)
+
+    # 고유 단어당 한 번만 교정 탐색 (같은 오타가 반복돼도 재계산 없음).
+    # 고유 오타가 충분히 많으면 단어 단위로 프로세스 풀에 분산하되,
+    # 이미 파일 단위 워커 안에서 돌고 있으면 중첩 풀은 만들지 않는다.
+    corrections = {}
+    if misspelled:
+        if (
+            len(misspelled) >= _PARALLEL_CORRECTION_MIN
+            and multiprocessing.parent_process() is None
+        ):
+            words = list(misspelled)
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                corrections = dict(
+                    zip(words, executor.map(_correct_word_worker, words, chunksize=64))
+                )
+        else:
+            trie = build_dictionary_trie(spell_checker)
+            corrections = {w: trie_correct(w, trie) for w in misspelled}
 
-    corrected_indices = []
+    corrected_indices = array("i")  # 박싱된 int 리스트 대신 C int 배열
+    replacements = []
     corrected_count = 0
 
-    for i in candidate_indices:
-        orig = tokens[i]
-        lw = orig.lower()
+    # candidate_words에 이미 소문자형이 있으므로 다시 lower() 하지 않는다
+    for i, lw in zip(candidate_indices, candidate_words):
         if lw not in misspelled:
             continue
 
-        suggestion = spell_checker.correction(lw)
+        suggestion = corrections.get(lw)
         if not suggestion or suggestion == lw:
             continue
 
-        # 원래 대소문자 형태 최대한 유지
+        # 교정이 확정된 위치에서만 원형을 실체화해 대소문자 형태 최대한 유지
+        orig = text[starts[i] : ends[i]]
         if orig.istitle():
             suggestion = suggestion.capitalize()
         elif orig.isupper():
             suggestion = suggestion.upper()
 
-        tokens[i] = suggestion
         corrected_indices.append(i)
+        replacements.append(suggestion)
         corrected_count += 1
 
-    # detokenize용 순수 토큰
-    safe_tokens = [t if isinstance(t, str) else "" for t in tokens]
-    corrected_text = detok.detokenize(safe_tokens)
-
-    # 하이라이트용 토큰 (HTML span 감싸기)
-    display_tokens = []
-    corrected_set = set(corrected_indices)
-    for idx, tok in enumerate(safe_tokens):
-        if idx in corrected_set and tok.strip():
-            display_tokens.append(f'<span class="corrected-word">{tok}</span>')
-        else:
-            display_tokens.append(tok)
-    highlighted_html = detok.detokenize(display_tokens)
+    # 원문 오프셋 기반 재조립: 교정 지점에서만 원문을 자르고 사이 구간은 통째로 복사
+    # (교정되지 않은 토큰은 원문 그대로이므로 전체 토큰 순회가 필요 없다)
+    plain_parts = []
+    html_parts = []
+    prev_end = 0
+    for i, new in zip(corrected_indices, replacements):
+        gap = text[prev_end : starts[i]]
+        plain_parts.append(gap)
+        plain_parts.append(new)
+        # HTML 쪽은 이스케이프 필수 — 원문의 <, & 가 div 렌더링을 깨지 않도록
+        html_parts.append(html.escape(gap))
+        html_parts.append('<span class="corrected-word">')
+        html_parts.append(html.escape(new))
+        html_parts.append("</span>")
+        prev_end = ends[i]
+    tail = text[prev_end:]
+    plain_parts.append(tail)
+    html_parts.append(html.escape(tail))
+    corrected_text = "".join(plain_parts)
+    highlighted_html = "".join(html_parts)
 
     stats = {
         "filename": filename,
-        "total_tokens": len(safe_tokens),
+        "total_tokens": len(spans),
         "candidate_count": len(candidate_words),
         "corrected_count": corrected_count,
     }
     return corrected_text, highlighted_html, stats
 
 
+def _run_spellcheck_chunked(
+    text,
+    filename,
+    spell_checker,
+    min_len,
+    ignore_all_caps,
+    ignore_title,
+    custom_ignore,
+):
+    """대용량 텍스트를 줄 단위 조각으로 나눠 처리하고 결과를 이어 붙인다."""
+    plain_parts = []
+    html_parts = []
+    stats = {
+        "filename": filename,
+        "total_tokens": 0,
+        "candidate_count": 0,
+        "corrected_count": 0,
+    }
+    for chunk in _iter_line_chunks(text):
+        chunk_text, chunk_html, chunk_stats = run_spellcheck_on_text(
+            chunk,
+            filename,
+            spell_checker,
+            min_len,
+            ignore_all_caps,
+            ignore_title,
+            custom_ignore,
+        )
+        plain_parts.append(chunk_text)
+        html_parts.append(chunk_html)
+        for key in ("total_tokens", "candidate_count", "corrected_count"):
+            stats[key] += chunk_stats[key]
+    return "".join(plain_parts), "".join(html_parts), stats
+
+
+@functools.lru_cache(maxsize=1)
+def _get_worker_spell_checker():
+    """워커 프로세스당 한 번만 사전 로딩 (이후 호출은 lru_cache 재사용)."""
+    return SpellChecker(language="en")
+
+
+def _correct_word_worker(word):
+    """고유 오타 하나를 교정. 프로세스 풀 map의 단위 작업으로 쓰는 최상위 함수."""
+    spell = _get_worker_spell_checker()
+    return trie_correct(word, build_dictionary_trie(spell))
+
+
+def process_one_file(raw, filename, opts):
+    """단일 파일 철자 검사. ProcessPoolExecutor 워커에 넘기는 최상위 진입점."""
+    return run_spellcheck_on_text(
+        raw,
+        filename=filename,
+        spell_checker=_get_worker_spell_checker(),
+        min_len=opts["min_len"],
+        ignore_all_caps=opts["ignore_all_caps"],
+        ignore_title=opts["ignore_title"],
+        custom_ignore=opts["custom_ignore"],
+    )
+
+
 # ----------------------------
 # Streamlit UI
 # ----------------------------
@@ -119,9 +340,7 @@ def main():
         page_title="Blue Spell (Yonsei Edition)",
         layout="wide",
     )
-    
-    ensure_nltk()
-    
+
     # ---- Custom CSS ----
     st.markdown(
         """
@@ -214,8 +433,7 @@ def main():
     unsafe_allow_html=True,
 )
 
-    ensure_nltk()
-    spell = SpellChecker(language="en")
+    spell = get_spell_checker()
 
     # ---- Sidebar: 옵션 ----
     with st.sidebar:
@@ -275,12 +493,11 @@ def main():
         custom_ignore = set()
         if custom_ignore_file is not None:
             try:
-                content = custom_ignore_file.read().decode("utf-8", errors="ignore")
-                custom_ignore = {
-                    line.strip().lower()
-                    for line in content.splitlines()
-                    if line.strip()
-                }
+                custom_ignore = parse_ignore_list(
+                    custom_ignore_file.name,
+                    custom_ignore_file.size,
+                    custom_ignore_file.getvalue(),
+                )
                 st.sidebar.success(f"무시할 단어 {len(custom_ignore)}개 로드됨")
             except Exception as e:
                 st.sidebar.error(f"무시 단어 리스트 로드 실패: {e}")
@@ -289,23 +506,47 @@ def main():
 
         st.markdown("### 2. 교정 결과")
 
-        for file in uploaded_files:
-            try:
-                raw = file.read().decode("utf-8", errors="ignore")
-            except Exception:
-                raw = file.read().decode("cp949", errors="ignore")
-
-            corrected_text, highlighted_html, stats = run_spellcheck_on_text(
-                raw,
-                filename=file.name,
-                spell_checker=spell,
-                min_len=min_len,
-                ignore_all_caps=ignore_all_caps,
-                ignore_title=ignore_title,
-                custom_ignore=custom_ignore,
-            )
+        file_inputs = [
+            # getvalue()는 BytesIO 내부 버퍼를 그대로 쓰고, errors="ignore"
+            # 디코드는 실패하지 않으므로 인코딩 폴백 분기가 필요 없다
+            (file.name, file.getvalue().decode("utf-8", errors="ignore"))
+            for file in uploaded_files
+        ]
+
+        opts = {
+            "min_len": min_len,
+            "ignore_all_caps": ignore_all_caps,
+            "ignore_title": ignore_title,
+            "custom_ignore": custom_ignore,
+        }
 
-            st.subheader(f"📄 파일: {file.name}")
+        # 파일 단위 작업은 서로 독립이므로 여러 파일이면 프로세스 풀로 병렬 처리
+        # (CPU 바운드 작업이라 스레드 대신 프로세스; 결과는 업로드 순서대로 렌더링)
+        if len(file_inputs) > 1:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = [
+                    executor.submit(process_one_file, raw, name, opts)
+                    for name, raw in file_inputs
+                ]
+                results = [f.result() for f in futures]
+        else:
+            results = [
+                run_spellcheck_on_text(
+                    raw,
+                    filename=name,
+                    spell_checker=spell,
+                    min_len=min_len,
+                    ignore_all_caps=ignore_all_caps,
+                    ignore_title=ignore_title,
+                    custom_ignore=custom_ignore,
+                )
+                for name, raw in file_inputs
+            ]
+
+        for (name, _), (corrected_text, highlighted_html, stats) in zip(
+            file_inputs, results
+        ):
+            st.subheader(f"📄 파일: {name}")
             col1, col2, col3 = st.columns(3)
             col1.metric("전체 토큰 수", stats["total_tokens"])
             col2.metric("철자 후보 단어 수", stats["candidate_count"])
@@ -320,18 +561,25 @@ def main():
             st.download_button(
                 label="💾 교정된 텍스트 파일 다운로드",
                 data=corrected_text.encode("utf-8"),
-                file_name=f"{file.name.rsplit('.', 1)[0]}_corrected.txt",
+                file_name=f"{name.rsplit('.', 1)[0]}_corrected.txt",
                 mime="text/plain",
             )
 
             summary_rows.append(stats)
 
         if summary_rows:
-            st.markdown("### 3. 전체 파일 요약 통계")
-            df = pd.DataFrame(summary_rows)
-            st.dataframe(df, use_container_width=True)
+            # pandas는 요약 테이블 표시에만 필요 — 여기서만 지연 임포트
+            import pandas as pd
 
-            csv_bytes = df.to_csv(index=False).encode("utf-8-sig")
+            st.markdown("### 3. 전체 파일 요약 통계")
+            st.dataframe(pd.DataFrame(summary_rows), use_container_width=True)
+
+            # 다운로드용 CSV는 DataFrame 직렬화 대신 csv 모듈로 바로 생성
+            buf = io.StringIO()
+            writer = csv.DictWriter(buf, fieldnames=list(summary_rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(summary_rows)
+            csv_bytes = buf.getvalue().encode("utf-8-sig")
             st.download_button(
                 label="📊 요약 통계 CSV 다운로드",
                 data=csv_bytes,